@@ -1,14 +1,29 @@
 import tkinter as tk
 from tkinter import messagebox
-from tkinter import filedialog, ttk
-import pandas as pd
+from tkinter import filedialog
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import CheckButtons
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import sys
-import os
-import re
+from nova_timeline import MergedTimeline
+from nova_parsers import EmptyFileError, InvalidFileError, read_cycler_file
+from nova_pipeline import (FrameStore, cycle_arrays, cycle_table, energy_density, file_metrics, potential_trend,
+                           rate_group_stats, rate_groups, sort_files)
+from nova_table import CycleTableView
+
+CYCLE_TABLE_HEADINGS = ["Zyklenzahl", "Ladekapazität (mAh)", "Entladekapazität (mAh)",
+                        "Coulomb Effizienz (%)", "Ladeenergie (mWh)", "Entladeenergie (mWh)",
+                        "Ladespannung (V)", "Entladespannung (V)",
+                        "Lade-Energiedichte (Wh/L)", "Entlade-Energiedichte (Wh/L)"]
+
+CYCLE_TABLE_LABELS = {
+    'title': "Zyklentabelle",
+    'cycle_from': "Zyklus von",
+    'cycle_to': "Zyklus bis",
+    'efficiency_below': "Effizienz unter (%)",
+    'status': "{shown} von {total} Zyklen",
+}
 
 class DataPlotterApp:
     def __init__(self, root):
@@ -18,12 +33,19 @@ class DataPlotterApp:
         self.energy_data = []
         self.energy_dens_data = []
         self.voltage_data = []
+        self.cycle_rows = []
+        self.cycle_files = {}
+        self.cycle_table_view = None
+        self.table_cycle_files = {}
+        self.selecting_from_table = False
+        self.rate_stats = []
         self.figures = []
         self.canvases = []
         self.root.protocol("WM_DELETE_WINDOW", sys.exit)
 
         self.show_efficiency = tk.BooleanVar(value=False)
         self.show_avg_voltage = tk.BooleanVar(value=False)
+        self.show_rates = tk.BooleanVar(value=False)
         self.ladung_zuerst = tk.BooleanVar(value=True)
 
         frame_controls = tk.Frame(root)
@@ -53,6 +75,9 @@ class DataPlotterApp:
         self.current_entry.pack()
         self.current_entry.bind("<KeyRelease>",self.plot_selected_files)
 
+        self.measured_label = tk.Label(frame_controls, text="")
+        self.measured_label.pack()
+
         self.volume_label = tk.Label(frame_controls, text="Volumen (L)")
         self.volume_label.pack()
 
@@ -71,25 +96,66 @@ class DataPlotterApp:
         self.checkbtn_vol = tk.Checkbutton(frame_controls, text="Zeige Durschschnittsspannung", variable=self.show_avg_voltage, command=self.toggle_avg_voltage)
         self.checkbtn_vol.pack()
 
+        self.checkbtn_rate = tk.Checkbutton(frame_controls, text="Kapazität nach C-Rate einfärben", variable=self.show_rates,
+                                            command=self.plot_selected_files)
+        self.checkbtn_rate.pack()
+
+        self.nominal_label = tk.Label(frame_controls, text="Nennkapazität (mAh)")
+        self.nominal_label.pack()
+
+        self.nominal_entry = tk.Entry(frame_controls)
+        self.nominal_entry.pack()
+        self.nominal_entry.bind("<KeyRelease>", self.plot_selected_files)
+
+        self.rate_label = tk.Label(frame_controls, text="", justify=tk.LEFT)
+        self.rate_label.pack()
+
         self.select_all_button = tk.Button(frame_controls, text="Alle auswählen", command=self.toggle_select_all)
         self.select_all_button.pack(pady=5)
 
         self.export_button = tk.Button(frame_controls, text="Exportieren", command=self.export_data)
         self.export_button.pack(pady=5)
 
+        self.export_timeline_button = tk.Button(frame_controls, text="Zeitreihe exportieren", command=self.export_timeline)
+        self.export_timeline_button.pack(pady=5)
+
+        self.cycle_table_button = tk.Button(frame_controls, text="Zyklentabelle", command=self.show_cycle_table)
+        self.cycle_table_button.pack(pady=5)
+
+        self.budget_label = tk.Label(frame_controls, text="Speicherbudget (MB)")
+        self.budget_label.pack()
+
+        self.budget_entry = tk.Entry(frame_controls)
+        self.budget_entry.insert(0, "512")
+        self.budget_entry.pack()
+        self.budget_entry.bind("<Return>", self.apply_memory_budget)
+
+        self.residency_label = tk.Label(frame_controls, text="")
+        self.residency_label.pack()
+
         frame_plots = tk.Frame(root)
         frame_plots.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
-        for _ in range(3):
+        for i in range(3):
             fig, ax = plt.subplots(figsize=(5,5))
-            canvas = FigureCanvasTkAgg(fig, master=frame_plots)
-            canvas.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            frame_plot = tk.Frame(frame_plots)
+            frame_plot.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            canvas = FigureCanvasTkAgg(fig, master=frame_plot)
+            if i == 0:
+                # Zoomen und Verschieben im Daten-Plot liest nur das sichtbare Fenster aus der Zeitreihe
+                NavigationToolbar2Tk(canvas, frame_plot).update()
+            canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
             self.figures.append(fig)
             self.canvases.append(canvas)
 
         self.ax4 = self.figures[1].axes[0].twinx()  # twin Achse nur einmal erzeugen
 
-        self.files = {}
+        self.files = FrameStore(int(float(self.budget_entry.get()) * 2**20))
+        self.trends = {}
+        self.metrics_cache = {}
+        self.timeline = MergedTimeline()
+        self.timeline_line = None
+        self.max_plot_points = 20000
 
     def toggle_efficiency(self):
         if self.show_efficiency.get():
@@ -102,79 +168,47 @@ class DataPlotterApp:
         self.plot_selected_files()
 
     def load_files(self):
-        filenames = filedialog.askopenfilenames(filetypes=[("Alle Dateien", "*.*")])
+        filenames = filedialog.askopenfilenames(filetypes=[("Alle Dateien", "*.*"),
+                                                           ("NOVA, BioLogic, Arbin, Neware", "*.txt *.mpt *.csv")])
 
         self.file_listbox.delete(0, tk.END)
         self.files.clear()
+        self.trends.clear()
+        self.metrics_cache.clear()
+        self.timeline.reset()
 
         max_filename_length = max([len(file) for file in filenames], default=50)
         self.file_listbox.config(width=max_filename_length+10)
 
         for file in filenames:
             try:
-                with open(file, "r", encoding="utf-8-sig") as f:
-                    lines = f.readlines()
-
-                header_index = None
-                for i, line in enumerate(lines):
-                    if "Corrected time" in line and "Potential" in line:
-                        header_index = i
-                        break
-
-                df = pd.read_csv(file, sep="\t", encoding="utf-8-sig", skiprows=header_index)
-                # Datei ist leer oder enthält keine Datenzeilen
-                if df.empty or len(df) < 2:
-                    messagebox.showerror("Leere Datei",
-                                         f"Die Datei ist leer oder unbrauchbar und wird übersprungen:\n{file}")
-                    continue
-
-                # Optional: Spaltenprüfung
-                if 'Time (s)' not in df.columns and 'Corrected time (s)' not in df.columns:
-                    messagebox.showerror("Ungültige Datei", f"Die Datei enthält keine gültige Zeitspalte:\n{file}")
-                    continue
-
+                df = read_cycler_file(file)
+                self.trends[file] = potential_trend(df)
                 self.files[file] = df
                 self.file_listbox.insert(tk.END, file)
-                if 'Corrected time (s)' not in df.columns and 'Time (s)' in df.columns:
-                    # Zeitdifferenzen berechnen
-                    time_diffs = df['Time (s)'].diff().fillna(0)
-
-                    # Kumulative Summe der Differenzen ergibt "Corrected time"
-                    df['Corrected time (s)'] = time_diffs.cumsum()
+                if 'Corrected time (s)' in df.columns and 'WE(1).Potential (V)' in df.columns:
+                    self.timeline.add_file(file, df['Corrected time (s)'], df['WE(1).Potential (V)'])
+            except EmptyFileError:
+                messagebox.showerror("Leere Datei",
+                                     f"Die Datei ist leer oder unbrauchbar und wird übersprungen:\n{file}")
+            except InvalidFileError:
+                messagebox.showerror("Ungültige Datei", f"Die Datei enthält keine gültige Zeitspalte:\n{file}")
             except Exception as e:
                 messagebox.showerror("Fehler", f"Fehler beim Laden der Datei:\n{file}\n\n{e}")
 
+        self.update_residency_label()
         self.sort_files_by_number_and_trend()
 
     def sort_files_by_number_and_trend(self):
         if not self.files:
             return
 
-        def extract_number(filename):
-            match = re.search(r"\((\d+)\)", os.path.basename(filename))
-            return int(match.group(1)) if match else float('0')
-
-        file_infos = []  # Liste mit: (filename, cycle_number, trend)
-
-        for file, df in self.files.items():
-            number = extract_number(file)
-            if 'WE(1).Potential (V)' in df.columns:
-                trend = df['WE(1).Potential (V)'].diff().mean()
-            else:
-                trend = 0  # Wenn Spannung fehlt, neutraler Trend
-
-            file_infos.append((file, number, trend))
-
-        def sort_key(item):
-            file, number, trend = item
-            trend_sort = 0 if (trend > 0) == self.ladung_zuerst.get() else 1
-            return (number, trend_sort)
-
-        sorted_files = sorted(file_infos, key=sort_key)
+        sorted_files = sort_files(self.trends, self.ladung_zuerst.get())
 
         self.file_listbox.delete(0, tk.END)
-        for file, _, _ in sorted_files:
+        for file in sorted_files:
             self.file_listbox.insert(tk.END, file)
+        self.timeline.set_layout(sorted_files)
 
     def toggle_select_all(self):
         #all_selected = len(self.file_listbox.curselection()) == self.file_listbox.size()
@@ -190,13 +224,15 @@ class DataPlotterApp:
         selected_indices = self.file_listbox.curselection()
         selected_files = [self.file_listbox.get(i) for i in selected_indices]
 
-        combined_df = pd.DataFrame(columns=['Time (s)', 'WE(1).Potential (V)'])
-        cumulative_time = 0
+        # Nur neu ausgewählte oder abgewählte Dateien ändern die Zeit-Offsets
+        self.timeline.select(selected_files)
 
         self.cycle_data = []
         self.energy_data = []
         self.energy_dens_data = []
         self.voltage_data = []
+        self.cycle_files = {}
+        cycle_entries = []
 
         # Zugriff auf die Achsen (ax) der 3 Diagramme
         ax1 = self.figures[0].axes[0]  # Erstes Diagramm
@@ -217,45 +253,20 @@ class DataPlotterApp:
 
         cycle_number = 1
         last_cycle_type = None
+        last_measured = None
+        volume = float(self.volume_entry.get())
 
         for file_path in selected_files:
-            df = self.files.get(file_path, None)
-
-            if df is not None and 'Corrected time (s)' in df.columns and 'WE(1).Potential (V)' in df.columns:
-                df['Time (s)'] = df['Corrected time (s)'] + cumulative_time
-                cumulative_time = df['Time (s)'].iloc[-1]
-                if 'Time (s)' in df.columns and 'WE(1).Potential (V)' in df.columns:
-                    subset = df[['Time (s)', 'WE(1).Potential (V)']].dropna(how='all')
-                    if not subset.empty:
-                        combined_df = pd.concat([combined_df, subset], ignore_index=True)
-
-                max_time = df['Corrected time (s)'].max()
-                if 'WE(1).Current (A)' in df.columns:
-                    current = float(df['WE(1).Current (A)'].mean())
-                    std_dev = float(df['WE(1).Current (A)'].std())
-                    self.current_entry.config(state=tk.NORMAL)  # sicherstellen, dass man reinschreiben kann
-                    self.current_entry.delete(0, tk.END)
-                    self.current_entry.insert(0, f"{current:.8f} ± {std_dev:.1e}")
-                    self.current_entry.config(state=tk.DISABLED)
-                else:
-                    current = float(self.current_entry.get())
-
-                capacity_mAh = (max_time * abs(current)) * 1000 / 3600
-                avg_voltage = df['WE(1).Potential (V)'].mean()
-
-                power_values = df['WE(1).Potential (V)'] * current  # oder Strom-Spalte
-                energy_J = abs(np.trapezoid(power_values, df['Corrected time (s)']))
-                energy_mWh = energy_J / 3.6
-
-                vol = float(self.volume_entry.get())
-                if vol > 0:
-                    energy_density_WhL = energy_mWh/(1000*vol)
-                else:
-                    energy_density_WhL = 0
+            m = self.metrics_for(file_path)
+            if m is not None:
+                if m['current_std_A'] is not None:
+                    last_measured = m
 
-
-                trend = df['WE(1).Potential (V)'].diff().mean()
-                cycle_type = 'Ladung' if trend > 0 else 'Entladung'
+                capacity_mAh = m['capacity_mAh']
+                avg_voltage = m['avg_voltage_V']
+                energy_mWh = m['energy_mWh']
+                energy_density_WhL = energy_density(energy_mWh, volume)
+                cycle_type = 'Ladung' if m['is_charge'] else 'Entladung'
 
                 if last_cycle_type == 'Entladung' and cycle_type == 'Ladung':
                     cycle_number += 1
@@ -265,9 +276,31 @@ class DataPlotterApp:
                 self.voltage_data.append((cycle_number, avg_voltage, cycle_type))
                 self.energy_data.append((cycle_number, energy_mWh, cycle_type))
                 self.energy_dens_data.append((cycle_number, energy_density_WhL, cycle_type))
+                cycle_entries.append((cycle_number, m))
+                self.cycle_files.setdefault(cycle_number, []).append(file_path)
+
+        self.cycle_rows = cycle_table([cycle for cycle, _ in cycle_entries], [m for _, m in cycle_entries], volume)
+        # Die Tabelle behält die Zyklen, aus denen sie erstellt wurde, solange ihre eigene Auswahl gezeichnet wird
+        if (self.cycle_table_view is not None and self.cycle_table_view.winfo_exists()
+                and not self.selecting_from_table):
+            self.cycle_table_view.set_data(cycle_arrays(self.cycle_rows))
+            self.table_cycle_files = dict(self.cycle_files)
+
+        # Gemessener Strom wird nur angezeigt; das Feld bleibt der Ersatzwert für Dateien ohne Stromspalte
+        if last_measured is not None:
+            self.measured_label.config(text=f"Gemessen: {last_measured['current_A']:.8f} ± "
+                                            f"{last_measured['current_std_A']:.1e} A\n"
+                                            f"Stufe: {last_measured['current_level_A']:.3g} A")
+        else:
+            self.measured_label.config(text="")
 
-        if not combined_df.empty:
-            ax1.plot(combined_df['Time (s)'], combined_df['WE(1).Potential (V)'], label='Zusammengeführte Daten')
+        self.timeline_line = None
+        if len(self.timeline):
+            time, potential = self.timeline.query(max_points=self.max_plot_points)
+            self.timeline_line, = ax1.plot(time, potential, label='Zusammengeführte Daten')
+            # Jetzt autoskalieren, damit der Callback nur bei Zoomen und Verschieben auslöst
+            ax1.autoscale_view()
+            ax1.callbacks.connect('xlim_changed', self.update_timeline_view)
 
             ax1.set_xlabel('Time (s)')
             ax1.set_ylabel('WE(1).Potential (V)')
@@ -277,10 +310,12 @@ class DataPlotterApp:
             self.canvases[0].draw()
 
 
-        for cycle, capacity, label in self.cycle_data:
-            color = 'blue' if label == 'Ladung' else 'red'
-            ax2.scatter(cycle, capacity, color=color,
-                             label=label if label not in ax2.get_legend_handles_labels()[1] else "_nolegend_")
+        self.rate_stats = []
+        if self.show_rates.get() and cycle_entries:
+            self.plot_capacity_by_rate(ax2, cycle_entries)
+        else:
+            self.rate_label.config(text="")
+            self.scatter_by_type(ax2, self.cycle_data)
 
         ax2.set_xlabel('Zyklenzahl')
         ax2.set_ylabel('Kapazität (mAh)')
@@ -317,10 +352,7 @@ class DataPlotterApp:
             ax4.legend(loc='best')
 
         elif self.show_avg_voltage.get():
-
-            for cycle, voltage, label in self.voltage_data:
-                color1 = 'blue' if label == 'Ladung' else 'red'
-                ax4.scatter(cycle, voltage,  color=color1, marker='x', label=label if label not in ax4.get_legend_handles_labels()[1] else "_nolegend_")
+            self.scatter_by_type(ax4, self.voltage_data, marker='x')
 
             ax4.set_ylabel("Durchschnittsspannung (V)", color='purple', loc='center')
             ax4.yaxis.set_label_position("right")
@@ -334,25 +366,124 @@ class DataPlotterApp:
         self.canvases[1].draw()
 
         if self.var.get():
-            for cycle, energydens, label in self.energy_dens_data:
-                color = 'blue' if label == 'Ladung' else 'red'
-                ax3.scatter(cycle, energydens, color=color,
-                            label=label if label not in ax3.get_legend_handles_labels()[1] else "_nolegend_")
-                ax3.set_xlabel('Zyklenzahl')
-                ax3.set_ylabel('Energiedichte (Wh/L)')
-                ax3.set_title('Energiedichte pro Zyklus')
+            self.scatter_by_type(ax3, self.energy_dens_data)
+            ax3.set_xlabel('Zyklenzahl')
+            ax3.set_ylabel('Energiedichte (Wh/L)')
+            ax3.set_title('Energiedichte pro Zyklus')
         else:
-            for cycle, energy, label in self.energy_data:
-                color = 'blue' if label == 'Ladung' else 'red'
-                ax3.scatter(cycle, energy, color=color,
-                                 label=label if label not in ax3.get_legend_handles_labels()[1] else "_nolegend_")
-                ax3.set_xlabel('Zyklenzahl')
-                ax3.set_ylabel('Energie (mWh)')
-                ax3.set_title('Energie pro Zyklus')
+            self.scatter_by_type(ax3, self.energy_data)
+            ax3.set_xlabel('Zyklenzahl')
+            ax3.set_ylabel('Energie (mWh)')
+            ax3.set_title('Energie pro Zyklus')
 
         ax3.legend()
         self.figures[2].tight_layout()
         self.canvases[2].draw()
+        self.update_residency_label()
+
+    def scatter_by_type(self, ax, data, **kwargs):
+        # Ein scatter-Aufruf pro Reihe (Ladung/Entladung) statt einer pro Punkt
+        for series in dict.fromkeys(label for _, _, label in data):
+            cycles, values = zip(*[(cycle, value) for cycle, value, label in data if label == series])
+            ax.scatter(cycles, values, color='blue' if series == 'Ladung' else 'red', label=series, **kwargs)
+
+    def plot_capacity_by_rate(self, ax, cycle_entries):
+        cycles = np.array([cycle for cycle, _ in cycle_entries])
+        levels = np.array([m['current_level_A'] for _, m in cycle_entries])
+        capacity = np.array([m['capacity_mAh'] for _, m in cycle_entries])
+        energy = np.array([m['energy_mWh'] for _, m in cycle_entries])
+        is_charge = np.array([m['is_charge'] for _, m in cycle_entries], dtype=bool)
+
+        group_ids, group_levels = rate_groups(levels)
+        nominal = self.nominal_entry.get().strip()
+        self.rate_stats = rate_group_stats(group_ids, group_levels, capacity, energy, is_charge,
+                                           float(nominal) if nominal else None)
+
+        # Farbe = Raten-Gruppe, Marker = Ladung (o) / Entladung (x); ein scatter-Aufruf pro Gruppe und Typ
+        colors = plt.cm.viridis(np.linspace(0, 0.9, len(group_levels)))
+        for s in self.rate_stats:
+            label = s['label']
+            for charge, marker in ((True, 'o'), (False, 'x')):
+                mask = (group_ids == s['group']) & (is_charge == charge)
+                if mask.any():
+                    ax.scatter(cycles[mask], capacity[mask], color=colors[s['group']], marker=marker, label=label)
+                    label = "_nolegend_"
+
+        lines = [f"{s['label']} ({s['current_A'] * 1000:.3g} mA): {s['discharge_count']} Entladungen, "
+                 f"{s['discharge_capacity_mAh']:.3f} ± {s['discharge_capacity_std']:.3f} mAh, "
+                 f"{s['discharge_energy_mWh']:.3f} ± {s['discharge_energy_std']:.3f} mWh"
+                 for s in self.rate_stats]
+        self.rate_label.config(text="\n".join(lines))
+
+    def apply_memory_budget(self, event=None):
+        self.files.set_budget(int(float(self.budget_entry.get()) * 2**20))
+        self.update_residency_label()
+
+    def update_residency_label(self):
+        s = self.files.stats()
+        self.residency_label.config(text=f"Im Speicher: {s['resident']}/{s['files']} Dateien, "
+                                         f"{s['resident_bytes'] / 2**20:.1f}/{s['budget_bytes'] / 2**20:.0f} MB\n"
+                                         f"Treffer: {s['hits']}  Fehlzugriffe: {s['misses']}")
+
+    def metrics_for(self, file_path):
+        # Kennzahlen pro Datei werden gemerkt; neu berechnet wird nur, wenn sich der Ersatzstrom ändert
+        cached = self.metrics_cache.get(file_path)
+        if cached is not None:
+            # Der erste Wert ist genau bei Dateien mit Stromspalte None; deren Kennzahlen hängen nie vom Eingabefeld ab
+            if cached[0] is None or cached[0] == float(self.current_entry.get()):
+                return cached[1]
+        df = self.files.get(file_path, None)
+        if df is None:
+            return None
+        if 'WE(1).Current (A)' in df.columns:
+            fallback_current = None
+        else:
+            fallback_current = float(self.current_entry.get())
+        metrics = file_metrics(df, fallback_current)
+        self.metrics_cache[file_path] = (fallback_current, metrics)
+        return metrics
+
+    def update_timeline_view(self, ax):
+        # Nur das sichtbare Zeitfenster aus der memory-mapped Zeitreihe neu lesen
+        if self.timeline_line is None:
+            return
+        t0, t1 = ax.get_xlim()
+        time, potential = self.timeline.query(t0, t1, max_points=self.max_plot_points)
+        self.timeline_line.set_data(time, potential)
+        self.canvases[0].draw_idle()
+
+    def show_cycle_table(self):
+        if self.cycle_table_view is None or not self.cycle_table_view.winfo_exists():
+            self.cycle_table_view = CycleTableView(self.root, CYCLE_TABLE_HEADINGS, CYCLE_TABLE_LABELS,
+                                                   on_select=self.select_cycles)
+        self.cycle_table_view.set_data(cycle_arrays(self.cycle_rows))
+        self.table_cycle_files = dict(self.cycle_files)
+        self.cycle_table_view.lift()
+
+    def select_cycles(self, cycles):
+        # Dateien der ausgewählten Tabellenzyklen zeichnen; die Tabelle behält Zeilen und Nummerierung
+        files = {file for cycle in cycles for file in self.table_cycle_files.get(cycle, [])}
+        listed = self.file_listbox.get(0, tk.END)
+        self.file_listbox.selection_clear(0, tk.END)
+        indices = [i for i, file in enumerate(listed) if file in files]
+        for i in indices:
+            self.file_listbox.select_set(i)
+        if indices:
+            self.file_listbox.see(indices[0])
+        self.selecting_from_table = True
+        try:
+            self.plot_selected_files()
+        finally:
+            self.selecting_from_table = False
+
+    def export_timeline(self):
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Textdateien", "*.txt"), ("Alle Dateien", "*.*")]
+        )
+        if not save_path:
+            return
+        self.timeline.write_tsv(save_path)
 
     def export_data(self):
         save_path = filedialog.asksaveasfilename(
@@ -363,56 +494,13 @@ class DataPlotterApp:
             return
 
         with open(save_path, 'w') as f:
-            f.write("Zyklenzahl\tLadekapazität (mAh)\tEntladekapazität (mAh)\t"
-                    "Coulomb Effizienz (%)\tLadeenergie (mWh)\tEntladeenergie (mWh)\t"
-                    "Ladespannung (V)\tEntladespannung (V)\t"
-                    "Lade-Energiedichte (Wh/L)\tEntlade-Energiedichte (Wh/L)\n")
-
-            cycle_data = {}
-            for cycle, capacity, cycle_type in self.cycle_data:
-                if cycle not in cycle_data:
-                    cycle_data[cycle] = {
-                        'Ladung': None,
-                        'Entladung': None,
-                        'Ladeenergie': None,
-                        'Entladeenergie': None,
-                        'Ladespannung': None,
-                        'Entladespannung': None,
-                        'LadeEnergiedichte': None,
-                        'EntladeEnergiedichte': None
-                    }
-                cycle_data[cycle][cycle_type] = capacity
-
-            for cycle, energy, cycle_type in self.energy_data:
-                if cycle in cycle_data:
-                    key = 'Ladeenergie' if cycle_type == 'Ladung' else 'Entladeenergie'
-                    cycle_data[cycle][key] = energy
-
-            for cycle, voltage, cycle_type in self.voltage_data:
-                if cycle in cycle_data:
-                    key = 'Ladespannung' if cycle_type == 'Ladung' else 'Entladespannung'
-                    cycle_data[cycle][key] = voltage
-
-            for cycle, dens, cycle_type in self.energy_dens_data:
-                if cycle in cycle_data:
-                    key = 'LadeEnergiedichte' if cycle_type == 'Ladung' else 'EntladeEnergiedichte'
-                    cycle_data[cycle][key] = dens
-
-            for cycle, data in sorted(cycle_data.items()):
-                lade_cap = data['Ladung'] or 0
-                entlade_cap = data['Entladung'] or 0
-                ratio = (entlade_cap / lade_cap * 100) if lade_cap > 0 else 0
-                lade_energy = data['Ladeenergie'] or 0
-                entlade_energy = data['Entladeenergie'] or 0
-                lade_spg = data['Ladespannung'] or 0
-                entlade_spg = data['Entladespannung'] or 0
-                lade_dens = data['LadeEnergiedichte'] or 0
-                entlade_dens = data['EntladeEnergiedichte'] or 0
-
-                f.write(f"{cycle}\t{lade_cap:.5f}\t{entlade_cap:.5f}\t{ratio:.2f}\t"
-                        f"{lade_energy:.5f}\t{entlade_energy:.5f}\t"
-                        f"{lade_spg:.5f}\t{entlade_spg:.5f}\t"
-                        f"{lade_dens:.5f}\t{entlade_dens:.5f}\n")
+            f.write("\t".join(CYCLE_TABLE_HEADINGS) + "\n")
+            for row in self.cycle_rows:
+                f.write(f"{row['cycle']}\t{row['charge_capacity_mAh']:.5f}\t{row['discharge_capacity_mAh']:.5f}\t"
+                        f"{row['efficiency_pct']:.2f}\t"
+                        f"{row['charge_energy_mWh']:.5f}\t{row['discharge_energy_mWh']:.5f}\t"
+                        f"{row['charge_voltage_V']:.5f}\t{row['discharge_voltage_V']:.5f}\t"
+                        f"{row['charge_energy_density_WhL']:.5f}\t{row['discharge_energy_density_WhL']:.5f}\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,230 @@
+"""Cycler file parsers.
+
+Every parser maps a vendor export onto the NOVA column schema used by the rest
+of the app ('Corrected time (s)', 'WE(1).Potential (V)', 'WE(1).Current (A)').
+The format is sniffed from the first SNIFF_BYTES of the file; parsers are tried
+in registration order and NOVA is the fallback. New formats are added with
+@register_parser on a CyclerParser subclass.
+"""
+import os
+import re
+import pandas as pd
+
+TIME_COL = 'Corrected time (s)'
+POTENTIAL_COL = 'WE(1).Potential (V)'
+CURRENT_COL = 'WE(1).Current (A)'
+NOVA_COLUMNS = {'Time (s)', TIME_COL, POTENTIAL_COL, CURRENT_COL}
+
+SNIFF_BYTES = 8192
+
+
+class EmptyFileError(ValueError):
+    """The file has no (or only one) data row."""
+
+
+class InvalidFileError(ValueError):
+    """The file has no usable time column."""
+
+
+PARSERS = []
+
+
+def register_parser(cls):
+    """Class decorator adding a parser to the sniffing order."""
+    PARSERS.append(cls())
+    return cls
+
+
+class CyclerParser:
+    name = None
+
+    def sniff(self, head):
+        """True if the decoded start of the file looks like this format."""
+        raise NotImplementedError
+
+    def read(self, path, head):
+        """DataFrame in the NOVA column schema."""
+        raise NotImplementedError
+
+
+def read_head(path, size=SNIFF_BYTES):
+    with open(path, "rb") as f:
+        raw = f.read(size)
+    return raw.decode("utf-8-sig", errors="replace")
+
+
+def finish_frame(df, path):
+    """Shared checks and 'Corrected time (s)' derivation for every parser."""
+    if df.empty or len(df) < 2:
+        raise EmptyFileError(path)
+    if 'Time (s)' not in df.columns and TIME_COL not in df.columns:
+        raise InvalidFileError(path)
+
+    if TIME_COL not in df.columns and 'Time (s)' in df.columns:
+        # Cumulative sum of time differences yields "Corrected time"
+        df[TIME_COL] = df['Time (s)'].diff().fillna(0).cumsum()
+    return df
+
+
+def uses_decimal_comma(lines):
+    """Tab separated data lines with digits around a ',' use a decimal comma."""
+    return any(re.search(r"\d,\d", line) for line in lines)
+
+
+@register_parser
+class BioLogicParser(CyclerParser):
+    """EC-Lab / BT-Lab .mpt text exports."""
+    name = "BioLogic"
+    time_col = 'time/s'
+    potential_col = 'Ewe/V'
+    current_cols = ('I/mA', '<I>/mA')  # not 'control/V/mA': a setpoint, in volts when potentiostatic
+
+    def sniff(self, head):
+        return head.startswith(("EC-Lab ASCII FILE", "BT-Lab ASCII FILE"))
+
+    def read(self, path, head):
+        match = re.search(r"Nb header lines\s*:\s*(\d+)", head)
+        header_lines = int(match.group(1)) if match else 1
+        data_lines = head.splitlines()[header_lines:header_lines + 5]
+        decimal = "," if uses_decimal_comma(data_lines) else "."
+
+        wanted = {self.time_col, self.potential_col, *self.current_cols}
+        df = pd.read_csv(path, sep="\t", encoding="latin-1", skiprows=header_lines - 1,
+                         decimal=decimal, usecols=lambda c: c in wanted)
+        if self.time_col not in df.columns or self.potential_col not in df.columns:
+            raise InvalidFileError(path)
+
+        out = pd.DataFrame({TIME_COL: df[self.time_col] - df[self.time_col].iloc[0],
+                            POTENTIAL_COL: df[self.potential_col]})
+        for col in self.current_cols:
+            if col in df.columns:
+                out[CURRENT_COL] = df[col] / 1000
+                break
+        return finish_frame(out, path)
+
+
+class CsvCyclerParser(CyclerParser):
+    """Comma separated exports with vendor specific column names.
+
+    Aliases are tried in order; current columns carry the factor to amperes.
+    Time columns listed in datetime_cols hold wall-clock timestamps.
+    """
+    required = ()
+    time_cols = ()
+    datetime_cols = ()
+    potential_cols = ()
+    current_cols = ()
+
+    def header(self, head):
+        return head.split("\n", 1)[0].strip()
+
+    def sniff(self, head):
+        columns = [c.strip().strip('"') for c in self.header(head).split(",")]
+        return all(any(req == c for c in columns) for req in self.required)
+
+    @staticmethod
+    def pick(columns, aliases):
+        for alias in aliases:
+            if alias in columns:
+                return alias
+        return None
+
+    def read(self, path, head):
+        columns = [c.strip().strip('"') for c in self.header(head).split(",")]
+        time_col = self.pick(columns, self.time_cols)
+        potential_col = self.pick(columns, self.potential_cols)
+        current_col = self.pick(columns, [name for name, _ in self.current_cols])
+        if time_col is None or potential_col is None:
+            raise InvalidFileError(path)
+
+        wanted = {time_col, potential_col, current_col} - {None}
+        df = pd.read_csv(path, encoding="utf-8-sig", usecols=lambda c: c.strip() in wanted,
+                         skipinitialspace=True)
+        df.columns = [c.strip() for c in df.columns]
+
+        time = df[time_col]
+        if time_col in self.datetime_cols:
+            # seconds since the epoch; made relative to the first sample below
+            time = (pd.to_datetime(time, errors="coerce") - pd.Timestamp(0)).dt.total_seconds()
+        elif not pd.api.types.is_numeric_dtype(time):
+            # hh:mm:ss(.fff) strings, converted in one vectorized call
+            time = pd.to_timedelta(time, errors="coerce").dt.total_seconds()
+        if time.isna().all():
+            raise InvalidFileError(path)
+        out = pd.DataFrame({TIME_COL: time - time.dropna().iloc[0], POTENTIAL_COL: df[potential_col]})
+        if current_col is not None:
+            out[CURRENT_COL] = df[current_col] * dict(self.current_cols)[current_col]
+        return finish_frame(out, path)
+
+
+@register_parser
+class ArbinParser(CsvCyclerParser):
+    name = "Arbin"
+    required = ('Data_Point', 'Voltage(V)')
+    time_cols = ('Test_Time(s)', 'Test Time (s)')
+    potential_cols = ('Voltage(V)',)
+    current_cols = (('Current(A)', 1.0),)
+
+
+@register_parser
+class NewareParser(CsvCyclerParser):
+    name = "Neware"
+    required = ('Voltage(V)',)
+    # 'Time' and 'Relative Time' restart with every step, so they are not usable here
+    time_cols = ('Total Time', 'Total Time(s)', 'Realtime')
+    datetime_cols = ('Realtime',)
+    potential_cols = ('Voltage(V)',)
+    current_cols = (('Current(A)', 1.0), ('Current(mA)', 0.001))
+
+    def sniff(self, head):
+        header = self.header(head)
+        return super().sniff(head) and ('Record' in header or 'DataPoint' in header or 'Total Time' in header)
+
+
+class NovaParser(CyclerParser):
+    """Autolab NOVA tab separated text exports."""
+    name = "NOVA"
+
+    @staticmethod
+    def is_header(line):
+        return "Corrected time" in line and "Potential" in line
+
+    def sniff(self, head):
+        return any(self.is_header(line) for line in head.splitlines())
+
+    def read(self, path, head):
+        header_index = None
+        for i, line in enumerate(head.splitlines()):
+            if self.is_header(line):
+                header_index = i
+                break
+        if header_index is None and os.path.getsize(path) > SNIFF_BYTES:
+            # Long preamble: stream the rest of the file instead of reading it whole
+            with open(path, "r", encoding="utf-8-sig") as f:
+                for i, line in enumerate(f):
+                    if self.is_header(line):
+                        header_index = i
+                        break
+
+        df = pd.read_csv(path, sep="\t", encoding="utf-8-sig", skiprows=header_index,
+                         usecols=lambda c: c in NOVA_COLUMNS)
+        return finish_frame(df, path)
+
+
+# Registered last: its header check is the least specific, and it is also the fallback
+NOVA_PARSER = NovaParser()
+PARSERS.append(NOVA_PARSER)
+
+
+def sniff_format(path):
+    """Parser for path, decided from the first SNIFF_BYTES only."""
+    head = read_head(path)
+    for parser in PARSERS:
+        if parser.sniff(head):
+            return parser, head
+    return NOVA_PARSER, head
+
+
+def read_cycler_file(path):
+    parser, head = sniff_format(path)
+    return parser.read(path, head)
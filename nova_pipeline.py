@@ -0,0 +1,450 @@
+import os
+import re
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from nova_parsers import CURRENT_COL, POTENTIAL_COL, TIME_COL, read_cycler_file
+
+
+def file_key(path):
+    """Cache key that changes whenever the file on disk changes."""
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+class ParseCache:
+    """Thread-safe cache of parsed files and their per-file metrics.
+
+    Concurrent requests for the same file wait for a single parse instead of
+    parsing it twice. Entries are invalidated when mtime or size change: the
+    entries of the previous version of a file are dropped as soon as the new
+    one is cached. Frames are kept under a byte budget and metrics under an
+    entry limit, least recently used evicted first.
+    """
+
+    def __init__(self, budget_bytes=512 * 2**20, max_metrics=100_000):
+        self.budget_bytes = budget_bytes
+        self.max_metrics = max_metrics
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._frames = OrderedDict()
+        self._sizes = {}
+        self._metrics = OrderedDict()
+        self._versions = {}
+        self.resident_bytes = 0
+
+    def _drop_frame(self, key):
+        if self._frames.pop(key, None) is not None:
+            self.resident_bytes -= self._sizes.pop(key)
+
+    def _track(self, key):
+        """Record key as the current version of its file and forget older versions."""
+        path = key[0]
+        old = self._versions.get(path)
+        if old is not None and old != key:
+            self._drop_frame(old)
+            for metrics_key in [k for k in self._metrics if k[0] == old]:
+                del self._metrics[metrics_key]
+        self._versions[path] = key
+
+    def get(self, path):
+        key = file_key(path)
+        with self._lock:
+            df = self._frames.get(key)
+            if df is not None:
+                self._frames.move_to_end(key)
+                return df
+            # Only created while the frame is missing; removed again once it is stored
+            lock = self._key_locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._lock:
+                df = self._frames.get(key)
+                if df is not None:  # parsed by the thread this one waited for
+                    self._frames.move_to_end(key)
+                    return df
+            try:
+                df = read_cycler_file(path)
+            except Exception:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+                raise
+            with self._lock:
+                # Released together with storing the frame, so no thread can miss both
+                self._key_locks.pop(key, None)
+                self._track(key)
+                self._drop_frame(key)
+                self._frames[key] = df
+                self._sizes[key] = int(df.memory_usage(deep=True).sum())
+                self.resident_bytes += self._sizes[key]
+                # The newest frame always stays, even if it alone exceeds the budget
+                while self.resident_bytes > self.budget_bytes and len(self._frames) > 1:
+                    self._drop_frame(next(iter(self._frames)))
+            return df
+
+    def metrics(self, path, fallback_current):
+        fkey = file_key(path)
+        with self._lock:
+            # Metrics that do not depend on the fallback current are stored under None
+            for key in ((fkey, None), (fkey, fallback_current)):
+                if key in self._metrics:
+                    self._metrics.move_to_end(key)
+                    return self._metrics[key]
+        m = file_metrics(self.get(path), fallback_current)
+        independent = m is None or m['current_std_A'] is not None
+        key = (fkey, None if independent else fallback_current)
+        with self._lock:
+            self._track(fkey)
+            self._metrics[key] = m
+            while len(self._metrics) > self.max_metrics:
+                self._metrics.popitem(last=False)
+        return m
+
+    def clear(self):
+        with self._lock:
+            self._key_locks.clear()
+            self._frames.clear()
+            self._sizes.clear()
+            self._metrics.clear()
+            self._versions.clear()
+            self.resident_bytes = 0
+
+
+class FrameStore:
+    """Parsed DataFrames kept under a memory budget, least recently used evicted first.
+
+    Behaves like the plain dict the GUI used before. An evicted frame is written
+    once to a pickle in a temporary directory and read back from there on the
+    next access, which is much faster than parsing the original export again.
+    """
+
+    def __init__(self, budget_bytes=512 * 2**20, directory=None):
+        self.budget_bytes = budget_bytes
+        self.directory = tempfile.mkdtemp(prefix="nova_frames_", dir=directory)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+        self._resident = OrderedDict()
+        self._sizes = {}
+        self._spilled = {}
+        self._names = {}
+        self._spill_count = 0
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def keys(self):
+        return self._names.keys()
+
+    def __setitem__(self, name, df):
+        if name in self._resident:
+            self.resident_bytes -= self._sizes[name]
+        self._names[name] = True
+        stale = self._spilled.pop(name, None)
+        if stale is not None and os.path.exists(stale):
+            os.remove(stale)
+        self._resident[name] = df
+        self._resident.move_to_end(name)
+        self._sizes[name] = int(df.memory_usage(index=True).sum())
+        self.resident_bytes += self._sizes[name]
+        self._evict()
+
+    def __getitem__(self, name):
+        if name in self._resident:
+            self.hits += 1
+            self._resident.move_to_end(name)
+            return self._resident[name]
+        if name not in self._names:
+            raise KeyError(name)
+        self.misses += 1
+        df = pd.read_pickle(self._spilled[name])
+        self._resident[name] = df
+        self.resident_bytes += self._sizes[name]
+        self._evict()
+        return df
+
+    def get(self, name, default=None):
+        return self[name] if name in self._names else default
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def _evict(self):
+        # The most recently used frame always stays, even if it alone exceeds the budget
+        while self.resident_bytes > self.budget_bytes and len(self._resident) > 1:
+            name, df = self._resident.popitem(last=False)
+            if name not in self._spilled:
+                self._spill_count += 1
+                path = os.path.join(self.directory, f"{self._spill_count}.pkl")
+                df.to_pickle(path)
+                self._spilled[name] = path
+            self.resident_bytes -= self._sizes[name]
+
+    def clear(self):
+        for path in self._spilled.values():
+            if os.path.exists(path):
+                os.remove(path)
+        self._resident.clear()
+        self._sizes.clear()
+        self._spilled.clear()
+        self._names.clear()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'files': len(self._names), 'resident': len(self._resident), 'resident_bytes': self.resident_bytes,
+                'budget_bytes': self.budget_bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+def extract_number(filename):
+    match = re.search(r"\((\d+)\)", os.path.basename(filename))
+    return int(match.group(1)) if match else float('0')
+
+
+def potential_trend(df):
+    if POTENTIAL_COL in df.columns:
+        return df[POTENTIAL_COL].diff().mean()
+    return 0  # If voltage is missing, neutral trend
+
+
+def sort_files(trends, charge_first=True):
+    """Order files by the number in brackets, then charge/discharge per charge_first.
+
+    trends: dict filename -> mean potential slope.
+    """
+    def sort_key(item):
+        file, trend = item
+        trend_sort = 0 if (trend > 0) == charge_first else 1
+        return (extract_number(file), trend_sort)
+
+    return [file for file, _ in sorted(trends.items(), key=sort_key)]
+
+
+def current_steps(current, rel_tol=0.05, min_samples=5):
+    """Constant-current steps of a current trace as (starts, stops, levels) arrays.
+
+    A new step starts wherever |I| jumps by more than rel_tol between two
+    samples, so noise inside a step does not split it. Rest samples (below 1 %
+    of the peak) and steps shorter than min_samples are dropped.
+    """
+    i = np.abs(np.nan_to_num(np.asarray(current, dtype=float)))
+    empty = np.empty(0, dtype=int)
+    if not len(i) or i.max() <= 0:
+        return empty, empty, np.empty(0)
+    active = i > 0.01 * i.max()
+    jump = np.abs(np.diff(i)) > rel_tol * np.maximum(i[:-1], i[1:])
+    change = np.flatnonzero(jump | (active[1:] != active[:-1])) + 1
+    starts = np.r_[0, change]
+    stops = np.r_[change, len(i)]
+    levels = np.add.reduceat(i, starts) / (stops - starts)
+    keep = active[starts] & (stops - starts >= min_samples)
+    return starts[keep], stops[keep], levels[keep]
+
+
+def current_level(current):
+    """|I| of the longest constant-current step, or the mean |I| if there is none."""
+    starts, stops, levels = current_steps(current)
+    if not len(levels):
+        return float(np.nanmean(np.abs(np.asarray(current, dtype=float))))
+    return float(levels[np.argmax(stops - starts)])
+
+
+def file_metrics(df, fallback_current):
+    """Per-file figures used by every plot and export.
+
+    The mean of the current column is used when present, otherwise
+    fallback_current. Energy density is derived later from energy_mWh and
+    the cell volume, so the result does not depend on the volume.
+    """
+    if TIME_COL not in df.columns or POTENTIAL_COL not in df.columns:
+        return None
+
+    max_time = df[TIME_COL].max()
+    if CURRENT_COL in df.columns:
+        current = float(df[CURRENT_COL].mean())
+        current_std = float(df[CURRENT_COL].std())
+        level = current_level(df[CURRENT_COL].to_numpy())
+    else:
+        current = float(fallback_current)
+        current_std = None
+        level = abs(current)
+
+    potential = df[POTENTIAL_COL]
+    trend = float(potential_trend(df))
+    energy_J = abs(np.trapezoid(potential * current, df[TIME_COL]))
+    return {
+        'duration_s': float(max_time),
+        'current_A': current,
+        'current_std_A': current_std,
+        'current_level_A': level,
+        'capacity_mAh': float((max_time * abs(current)) * 1000 / 3600),
+        'avg_voltage_V': float(potential.mean()),
+        'energy_mWh': float(energy_J / 3.6),
+        'trend': trend,
+        'is_charge': bool(trend > 0),
+        'samples': int(df[TIME_COL].notna().sum()),
+    }
+
+
+def energy_density(energy_mWh, volume):
+    return energy_mWh / (1000 * volume) if volume > 0 else 0
+
+
+def assign_cycles(metrics):
+    """Cycle number per entry; a new cycle starts on every discharge -> charge step."""
+    cycles = []
+    cycle_number = 1
+    last_charge = None
+    for m in metrics:
+        if last_charge is False and m['is_charge']:
+            cycle_number += 1
+        last_charge = m['is_charge']
+        cycles.append(cycle_number)
+    return cycles
+
+
+CYCLE_TABLE_COLUMNS = [
+    'cycle', 'charge_capacity_mAh', 'discharge_capacity_mAh', 'efficiency_pct',
+    'charge_energy_mWh', 'discharge_energy_mWh', 'charge_voltage_V', 'discharge_voltage_V',
+    'charge_energy_density_WhL', 'discharge_energy_density_WhL',
+]
+
+
+def cycle_table(cycles, metrics, volume):
+    """One row per cycle with the same columns and defaults as the GUI export."""
+    per_cycle = {}
+    for cycle, m in zip(cycles, metrics):
+        side = 'charge' if m['is_charge'] else 'discharge'
+        row = per_cycle.setdefault(cycle, {})
+        row[f'{side}_capacity_mAh'] = m['capacity_mAh']
+        row[f'{side}_energy_mWh'] = m['energy_mWh']
+        row[f'{side}_voltage_V'] = m['avg_voltage_V']
+        row[f'{side}_energy_density_WhL'] = energy_density(m['energy_mWh'], volume)
+
+    rows = []
+    for cycle, data in sorted(per_cycle.items()):
+        row = {col: data.get(col) or 0 for col in CYCLE_TABLE_COLUMNS}
+        row['cycle'] = cycle
+        charge_cap = row['charge_capacity_mAh']
+        row['efficiency_pct'] = (row['discharge_capacity_mAh'] / charge_cap * 100) if charge_cap > 0 else 0
+        rows.append(row)
+    return rows
+
+
+def cycle_arrays(rows):
+    """Column arrays of a cycle table, for vectorized sorting and filtering."""
+    return {col: np.array([row[col] for row in rows], dtype=float) for col in CYCLE_TABLE_COLUMNS}
+
+
+def rate_groups(levels, rel_tol=0.1):
+    """Group current levels that lie within rel_tol of their sorted neighbour.
+
+    Returns (group_ids, group_levels); groups are numbered by increasing current.
+    """
+    levels = np.asarray(levels, dtype=float)
+    if not len(levels):
+        return np.empty(0, dtype=int), np.empty(0)
+    order = np.argsort(levels, kind='stable')
+    ordered = levels[order]
+    new_group = np.r_[True, np.diff(ordered) > rel_tol * ordered[1:]]
+    ids = np.empty(len(levels), dtype=int)
+    ids[order] = np.cumsum(new_group) - 1
+    group_levels = np.bincount(ids, weights=levels) / np.bincount(ids)
+    return ids, group_levels
+
+
+def c_rate_label(c_rate):
+    if c_rate <= 0:
+        return "0C"
+    return f"{c_rate:.3g}C" if c_rate >= 1 else f"C/{1 / c_rate:.3g}"
+
+
+def rate_group_stats(group_ids, group_levels, capacity_mAh, energy_mWh, is_charge, nominal_mAh=None):
+    """Per rate group count, mean and std of capacity and energy, split into charge/discharge.
+
+    All groups are computed together with bincount. Without a nominal capacity
+    the mean discharge capacity of the lowest-current group is used as 1C.
+    """
+    n_groups = len(group_levels)
+    key = np.asarray(group_ids) * 2 + ~np.asarray(is_charge, dtype=bool)
+    counts = np.bincount(key, minlength=2 * n_groups).reshape(n_groups, 2)
+
+    def mean_std(values):
+        values = np.asarray(values, dtype=float)
+        total = np.bincount(key, weights=values, minlength=2 * n_groups).reshape(n_groups, 2)
+        squares = np.bincount(key, weights=values * values, minlength=2 * n_groups).reshape(n_groups, 2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(counts > 0, total / counts, 0.0)
+            std = np.sqrt(np.maximum(np.where(counts > 0, squares / counts, 0.0) - mean ** 2, 0.0))
+        return mean, std
+
+    capacity_mean, capacity_std = mean_std(capacity_mAh)
+    energy_mean, energy_std = mean_std(energy_mWh)
+
+    if not nominal_mAh or nominal_mAh <= 0:
+        nominal_mAh = capacity_mean[0, 1] if n_groups and counts[0, 1] else max(capacity_mAh, default=0)
+
+    stats = []
+    for g in range(n_groups):
+        c_rate = group_levels[g] * 1000 / nominal_mAh if nominal_mAh > 0 else 0.0
+        stats.append({
+            'group': g, 'current_A': float(group_levels[g]), 'c_rate': float(c_rate),
+            'label': c_rate_label(c_rate),
+            'charge_count': int(counts[g, 0]), 'discharge_count': int(counts[g, 1]),
+            'charge_capacity_mAh': float(capacity_mean[g, 0]), 'charge_capacity_std': float(capacity_std[g, 0]),
+            'discharge_capacity_mAh': float(capacity_mean[g, 1]),
+            'discharge_capacity_std': float(capacity_std[g, 1]),
+            'charge_energy_mWh': float(energy_mean[g, 0]), 'charge_energy_std': float(energy_std[g, 0]),
+            'discharge_energy_mWh': float(energy_mean[g, 1]), 'discharge_energy_std': float(energy_std[g, 1]),
+        })
+    return stats
+
+
+def folder_files(folder):
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+            if os.path.isfile(os.path.join(folder, name))]
+
+
+def load_folder(folder, current=0.02, charge_first=True, cache=None):
+    """Parse and order every NOVA export in folder the way the GUI does.
+
+    Returns (paths, metrics, skipped): paths and metrics are aligned and in
+    plotting order, skipped maps unusable files to the reason.
+    """
+    cache = cache or ParseCache()
+    by_path = {}
+    skipped = {}
+    for path in folder_files(folder):
+        # Trend and metrics come from one parse; a cached result needs no frame at all
+        try:
+            m = cache.metrics(path, current)
+        except Exception as e:
+            skipped[path] = f"{type(e).__name__}: {e}"
+            continue
+        if m is not None:
+            by_path[path] = m
+
+    paths = sort_files({path: m['trend'] for path, m in by_path.items()}, charge_first)
+    return paths, [by_path[path] for path in paths], skipped
+
+
+def analyze_folder(folder, current=0.02, volume=0.02, charge_first=True, cache=None):
+    """Run the full GUI pipeline on every NOVA export in folder.
+
+    Returns (rows, skipped) where skipped maps unusable files to the reason.
+    """
+    _, metrics, skipped = load_folder(folder, current, charge_first, cache)
+    return cycle_table(assign_cycles(metrics), metrics, volume), skipped
@@ -0,0 +1,198 @@
+"""Batch rendering of the GUI figures into one multi-page PDF per cell.
+
+    python nova_report.py CELL_DIR [CELL_DIR ...] --out reports --workers 8
+    python nova_report.py --cells-in CAMPAIGN_DIR --out reports --png
+
+Every cell folder is rendered in its own worker process with the Agg backend.
+An index.tsv summarising all cells is written next to the reports.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+import numpy as np
+
+from nova_pipeline import (POTENTIAL_COL, TIME_COL, ParseCache, assign_cycles, cycle_table,
+                           energy_density, load_folder)
+
+MAX_PLOT_POINTS = 20000
+
+
+def plot_potential(ax, paths, metrics, cache):
+    """Plot all files back to back, every file strided so the whole plot has about MAX_PLOT_POINTS."""
+    step = max(1, -(-sum(m['samples'] for m in metrics) // MAX_PLOT_POINTS))
+    times = []
+    potentials = []
+    offset = 0.0
+    for path in paths:
+        df = cache.get(path)
+        time = df[TIME_COL].to_numpy(dtype=np.float64)
+        potential = df[POTENTIAL_COL].to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(time))  # rows without a time stamp cannot be placed
+        if not len(valid):
+            continue
+        rows = valid[::step]
+        times.append(time[rows] + offset)
+        potentials.append(potential[rows])
+        offset += time[valid[-1]]
+    if times:
+        ax.plot(np.concatenate(times), np.concatenate(potentials), label='Merged data')
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('WE(1).Potential (V)')
+    ax.set_title('Data plot')
+    ax.legend()
+
+
+def scatter_by_type(ax, cycles, values, metrics):
+    for is_charge, color, label in ((True, 'blue', 'Charge'), (False, 'red', 'Discharge')):
+        points = [(c, v) for c, v, m in zip(cycles, values, metrics) if m['is_charge'] == is_charge]
+        if points:
+            x, y = zip(*points)
+            ax.scatter(x, y, color=color, label=label)
+
+
+def plot_capacity(ax, cycles, metrics, rows):
+    scatter_by_type(ax, cycles, [m['capacity_mAh'] for m in metrics], metrics)
+    ax.set_xlabel('Cycle number')
+    ax.set_ylabel('Capacity (mAh)')
+    ax.set_title('Capacity per cycle')
+    ax.legend(loc='upper left')
+    ax.set_ylim(bottom=0)
+
+    paired = [r for r in rows if r['charge_capacity_mAh'] > 0 and r['discharge_capacity_mAh'] > 0]
+    ax_eff = ax.twinx()
+    ax_eff.scatter([r['cycle'] for r in paired], [r['efficiency_pct'] for r in paired],
+                   color='green', marker='o', label='Coulombic efficiency')
+    ax_eff.set_ylabel("Coulombic efficiency (%)", color='green', loc='center')
+    ax_eff.tick_params(axis='y', labelcolor='green')
+    ax_eff.legend(loc='upper right')
+
+
+def plot_energy(ax, cycles, metrics, volume, show_density=False):
+    if show_density:
+        values = [energy_density(m['energy_mWh'], volume) for m in metrics]
+        ylabel, title = 'Energy density (Wh/L)', 'Energy density per cycle'
+    else:
+        values = [m['energy_mWh'] for m in metrics]
+        ylabel, title = 'Energy (mWh)', 'Energy per cycle'
+    scatter_by_type(ax, cycles, values, metrics)
+    ax.set_xlabel('Cycle number')
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.legend()
+
+
+def render_cell(folder, out_dir, current=0.02, volume=0.02, charge_first=True, png=False, show_density=False,
+                name=None):
+    """Render the three GUI figures of one cell; returns a summary dict for the index."""
+    name = name or os.path.basename(os.path.normpath(folder))
+    # One cache per cell: the frames are only needed while this cell is rendered
+    cache = ParseCache()
+    paths, metrics, skipped = load_folder(folder, current, charge_first, cache)
+    summary = {'cell': name, 'folder': folder, 'files': len(paths), 'skipped': len(skipped),
+               'cycles': 0, 'last_discharge_mAh': 0, 'mean_efficiency_pct': 0, 'report': '', 'error': ''}
+    if not metrics:
+        return summary
+
+    cycles = assign_cycles(metrics)
+    rows = cycle_table(cycles, metrics, volume)
+    paired = [r['efficiency_pct'] for r in rows if r['charge_capacity_mAh'] > 0 and r['discharge_capacity_mAh'] > 0]
+    summary['cycles'] = len(rows)
+    summary['last_discharge_mAh'] = rows[-1]['discharge_capacity_mAh']
+    summary['mean_efficiency_pct'] = sum(paired) / len(paired) if paired else 0
+
+    pdf_path = os.path.join(out_dir, f"{name}.pdf")
+    figures = []
+    for draw in (lambda ax: plot_potential(ax, paths, metrics, cache),
+                 lambda ax: plot_capacity(ax, cycles, metrics, rows),
+                 lambda ax: plot_energy(ax, cycles, metrics, volume, show_density)):
+        fig, ax = plt.subplots(figsize=(8, 5))
+        draw(ax)
+        fig.suptitle(name)
+        fig.tight_layout()
+        figures.append(fig)
+
+    with PdfPages(pdf_path) as pdf:
+        for i, fig in enumerate(figures, start=1):
+            pdf.savefig(fig)
+            if png:
+                fig.savefig(os.path.join(out_dir, f"{name}_{i}.png"), dpi=150)
+            plt.close(fig)
+    summary['report'] = os.path.basename(pdf_path)
+    return summary
+
+
+def write_index(summaries, out_dir):
+    path = os.path.join(out_dir, "index.tsv")
+    with open(path, 'w') as f:
+        f.write("Cell\tFiles\tSkipped\tCycles\tLast discharge capacity (mAh)\t"
+                "Mean Coulombic efficiency (%)\tReport\tFolder\tError\n")
+        for s in sorted(summaries, key=lambda s: s['cell']):
+            f.write(f"{s['cell']}\t{s['files']}\t{s['skipped']}\t{s['cycles']}\t"
+                    f"{s['last_discharge_mAh']:.5f}\t{s['mean_efficiency_pct']:.2f}\t"
+                    f"{s['report']}\t{s['folder']}\t{s['error']}\n")
+    return path
+
+
+def cell_names(folders):
+    """Report name per folder: its basename, or its path below the common parent where basenames clash."""
+    names = [os.path.basename(os.path.normpath(folder)) for folder in folders]
+    if len(set(names)) < len(names):
+        common = os.path.commonpath([os.path.abspath(folder) for folder in folders])
+        names = [os.path.relpath(os.path.abspath(folder), common).replace(os.sep, '_') for folder in folders]
+    if len(set(names)) < len(names):
+        raise ValueError("the same cell folder is given more than once")
+    return names
+
+
+def render_reports(folders, out_dir, workers=None, current=0.02, volume=0.02, charge_first=True, png=False,
+                   show_density=False):
+    names = cell_names(folders)
+    os.makedirs(out_dir, exist_ok=True)
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_cell, folder, out_dir, current, volume, charge_first, png,
+                               show_density, name): (folder, name)
+                   for folder, name in zip(folders, names)}
+        for future in as_completed(futures):
+            folder, name = futures[future]
+            try:
+                summaries.append(future.result())
+            except Exception as e:
+                print(f"Error rendering {folder}: {e}")
+                summaries.append({'cell': name, 'folder': folder,
+                                  'files': 0, 'skipped': 0, 'cycles': 0, 'last_discharge_mAh': 0,
+                                  'mean_efficiency_pct': 0, 'report': '',
+                                  'error': f"{type(e).__name__}: {e}".replace('\t', ' ').replace('\n', ' ')})
+    return write_index(summaries, out_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render PDF reports for many cells in parallel")
+    parser.add_argument("folders", nargs="*", help="one folder of NOVA exports per cell")
+    parser.add_argument("--cells-in", help="treat every subfolder of this folder as a cell")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--current", type=float, default=0.02)
+    parser.add_argument("--volume", type=float, default=0.02)
+    parser.add_argument("--discharge-first", action="store_true")
+    parser.add_argument("--png", action="store_true", help="also write one PNG per figure")
+    parser.add_argument("--energy-density", action="store_true", help="plot Wh/L instead of mWh")
+    args = parser.parse_args()
+
+    folders = list(args.folders)
+    if args.cells_in:
+        folders += [os.path.join(args.cells_in, name) for name in sorted(os.listdir(args.cells_in))
+                    if os.path.isdir(os.path.join(args.cells_in, name))]
+    if not folders:
+        parser.error("no cell folders given")
+    try:
+        index = render_reports(folders, args.out, args.workers, args.current, args.volume,
+                               not args.discharge_first, args.png, args.energy_density)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Wrote {index}")
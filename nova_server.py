@@ -0,0 +1,182 @@
+"""Local HTTP/JSON server exposing the NOVA analysis pipeline.
+
+    python nova_server.py --port 8765 --workers 4
+
+POST /jobs            {"folder": "...", "current": 0.02, "volume": 0.02, "charge_first": true}
+GET  /jobs/<id>       job status
+GET  /jobs/<id>/cycles cycle table (same columns as the GUI export)
+"""
+import argparse
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from nova_pipeline import ParseCache, analyze_folder, file_key, folder_files
+
+
+class JobManager:
+    """Bounded worker pool; identical requests on an unchanged folder share one job.
+
+    Finished jobs are kept for `job_ttl` seconds after they complete, then
+    forgotten together with their results.
+    """
+
+    def __init__(self, workers=4, max_pending=64, job_ttl=3600):
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.cache = ParseCache()
+        self.max_pending = max_pending
+        self.job_ttl = job_ttl
+        self.jobs = {}
+        self.by_key = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def folder_signature(folder):
+        sig = []
+        for path in folder_files(folder):
+            try:
+                sig.append(file_key(path))
+            except OSError:
+                pass
+        return tuple(sig)
+
+    def _expire(self):
+        """Drop finished jobs older than job_ttl; caller holds the lock."""
+        deadline = time.monotonic() - self.job_ttl
+        expired = {job_id for job_id, job in self.jobs.items()
+                   if job['finished'] is not None and job['finished'] < deadline}
+        if not expired:
+            return
+        for job_id in expired:
+            del self.jobs[job_id]
+        self.by_key = {key: job_id for key, job_id in self.by_key.items() if job_id not in expired}
+
+    def submit(self, folder, current, volume, charge_first):
+        folder = os.path.abspath(folder)
+        key = (folder, current, volume, charge_first, self.folder_signature(folder))
+        with self.lock:
+            self._expire()
+            job_id = self.by_key.get(key)
+            if job_id is not None and self.jobs[job_id]['status'] != 'failed':
+                return self.jobs[job_id], False
+
+            pending = sum(job['status'] in ('queued', 'running') for job in self.jobs.values())
+            if pending >= self.max_pending:
+                return None, False
+
+            job_id = uuid.uuid4().hex
+            job = {'id': job_id, 'status': 'queued', 'folder': folder, 'current': current,
+                   'volume': volume, 'charge_first': charge_first, 'error': None,
+                   'skipped': {}, 'cycles': None, 'finished': None}
+            self.jobs[job_id] = job
+            self.by_key[key] = job_id
+        self.pool.submit(self._run, job)
+        return job, True
+
+    def _run(self, job):
+        job['status'] = 'running'
+        try:
+            rows, skipped = analyze_folder(job['folder'], job['current'], job['volume'],
+                                           job['charge_first'], self.cache)
+            job['cycles'] = rows
+            job['skipped'] = skipped
+            job['status'] = 'done'
+        except Exception as e:
+            job['error'] = f"{type(e).__name__}: {e}"
+            job['status'] = 'failed'
+        finally:
+            job['finished'] = time.monotonic()
+
+    def get(self, job_id):
+        with self.lock:
+            self._expire()
+            return self.jobs.get(job_id)
+
+
+def positive_number(req, name, default):
+    """Finite positive JSON number; NaN would also break deduplication, as it never equals itself."""
+    value = req.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"{name} must be a number")
+    if not math.isfinite(value) or value <= 0:
+        raise ValueError(f"{name} must be a finite positive number")
+    return float(value)
+
+
+def status_view(job):
+    return {k: v for k, v in job.items() if k not in ('cycles', 'finished')}
+
+
+class Handler(BaseHTTPRequestHandler):
+    manager = None
+
+    def _send(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            return self._send(404, {'error': 'not found'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            req = json.loads(self.rfile.read(length) or b'{}')
+            folder = req['folder']
+            current = positive_number(req, 'current', 0.02)
+            volume = positive_number(req, 'volume', 0.02)
+            charge_first = req.get('charge_first', True)
+            if not isinstance(folder, str):
+                raise TypeError("folder must be a string")
+            if not isinstance(charge_first, bool):
+                raise TypeError("charge_first must be true or false")
+            if not os.path.isdir(folder):
+                return self._send(400, {'error': f"not a folder: {folder}"})
+        except (KeyError, TypeError, ValueError) as e:
+            return self._send(400, {'error': f"invalid request: {e}"})
+
+        job, created = self.manager.submit(folder, current, volume, charge_first)
+        if job is None:
+            return self._send(503, {'error': 'too many pending jobs'})
+        self._send(202 if created else 200, status_view(job))
+
+    def do_GET(self):
+        parts = [p for p in self.path.split('/') if p]
+        if len(parts) not in (2, 3) or parts[0] != 'jobs' or (len(parts) == 3 and parts[2] != 'cycles'):
+            return self._send(404, {'error': 'not found'})
+        job = self.manager.get(parts[1])
+        if job is None:
+            return self._send(404, {'error': 'unknown job'})
+        if len(parts) == 2:
+            return self._send(200, status_view(job))
+        if job['status'] != 'done':
+            return self._send(409, status_view(job))
+        self._send(200, {'id': job['id'], 'cycles': job['cycles']})
+
+
+def serve(host="127.0.0.1", port=8765, workers=4, max_pending=64, job_ttl=3600):
+    Handler.manager = JobManager(workers, max_pending, job_ttl)
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving NOVA analysis on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        Handler.manager.pool.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON server for NOVA cycle tables")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--job-ttl", type=float, default=3600, help="seconds to keep finished jobs")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.max_pending, args.job_ttl)
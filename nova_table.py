@@ -0,0 +1,159 @@
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+
+from nova_pipeline import CYCLE_TABLE_COLUMNS
+
+LABELS = {
+    'title': "Cycle table",
+    'cycle_from': "Cycle from",
+    'cycle_to': "Cycle to",
+    'efficiency_below': "Efficiency below (%)",
+    'status': "{shown} of {total} cycles",
+}
+
+
+class CycleTableView(tk.Toplevel):
+    """Sortable, filterable cycle table that only renders the visible rows.
+
+    The Treeview holds a fixed pool of `visible_rows` items whose values are
+    rewritten on scrolling, so the widget cost does not grow with the number of
+    cycles. Sorting and filtering work on the column arrays with numpy and only
+    produce an index array (`view`) into them.
+    """
+
+    def __init__(self, master, headings, labels=LABELS, on_select=None, visible_rows=30):
+        super().__init__(master)
+        self.title(labels['title'])
+        self.labels = labels
+        self.on_select = on_select
+        self.visible_rows = visible_rows
+
+        self.data = {col: np.empty(0) for col in CYCLE_TABLE_COLUMNS}
+        self.view = np.arange(0)
+        self.first = 0
+        self.sort_column = 'cycle'
+        self.descending = False
+        self.selected_cycles = set()
+        self.visible_cycles = set()
+        self.rendered_selection = set()
+
+        frame_filters = tk.Frame(self)
+        frame_filters.pack(side=tk.TOP, fill=tk.X)
+        self.filter_entries = {}
+        for key in ('cycle_from', 'cycle_to', 'efficiency_below'):
+            tk.Label(frame_filters, text=labels[key]).pack(side=tk.LEFT, padx=5)
+            entry = tk.Entry(frame_filters, width=8)
+            entry.pack(side=tk.LEFT)
+            entry.bind("<KeyRelease>", self.apply)
+            self.filter_entries[key] = entry
+        self.status_label = tk.Label(frame_filters, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=5)
+
+        frame_table = tk.Frame(self)
+        frame_table.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(frame_table, columns=CYCLE_TABLE_COLUMNS, show='headings',
+                                 height=visible_rows, selectmode=tk.EXTENDED)
+        for col, heading in zip(CYCLE_TABLE_COLUMNS, headings):
+            self.tree.heading(col, text=heading, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=120, anchor=tk.E)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.scrollbar = ttk.Scrollbar(frame_table, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        self.items = [self.tree.insert('', tk.END) for _ in range(visible_rows)]
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        # Only the sign of the delta: it is a multiple of 120 on Windows but 1-10 on macOS
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_to(self.first + (-3 if e.delta > 0 else 3)))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.first - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.first + 3))
+
+    def set_data(self, arrays):
+        self.data = arrays
+        self.selected_cycles = set()  # cycle numbers of the previous data
+        self.apply()
+
+    def _filter_value(self, key):
+        try:
+            return float(self.filter_entries[key].get())
+        except ValueError:
+            return None  # empty or still being typed
+
+    def apply(self, event=None):
+        cycles = self.data['cycle']
+        mask = np.ones(len(cycles), dtype=bool)
+        cycle_from = self._filter_value('cycle_from')
+        cycle_to = self._filter_value('cycle_to')
+        efficiency_below = self._filter_value('efficiency_below')
+        if cycle_from is not None:
+            mask &= cycles >= cycle_from
+        if cycle_to is not None:
+            mask &= cycles <= cycle_to
+        if efficiency_below is not None:
+            mask &= self.data['efficiency_pct'] < efficiency_below
+
+        rows = np.flatnonzero(mask)
+        order = np.argsort(self.data[self.sort_column][rows], kind='stable')
+        if self.descending:
+            order = order[::-1]
+        self.view = rows[order]
+        self.status_label.config(text=self.labels['status'].format(shown=len(self.view), total=len(cycles)))
+        self.scroll_to(self.first)
+
+    def sort_by(self, column):
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+        self.apply()
+
+    def scroll_to(self, first):
+        self.first = max(0, min(first, len(self.view) - self.visible_rows))
+        self.render()
+
+    def on_scroll(self, action, value, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * len(self.view)))
+        elif unit == 'pages':
+            self.scroll_to(self.first + int(value) * self.visible_rows)
+        else:
+            self.scroll_to(self.first + int(value))
+
+    def render(self):
+        rows = self.view[self.first:self.first + self.visible_rows]
+        self.visible_cycles = {int(cycle) for cycle in self.data['cycle'][rows]}
+        selection = []
+        for i, item in enumerate(self.items):
+            if i < len(rows):
+                row = rows[i]
+                values = [f"{int(self.data['cycle'][row])}"]
+                for col in CYCLE_TABLE_COLUMNS[1:]:
+                    values.append(f"{self.data[col][row]:.2f}" if col == 'efficiency_pct'
+                                  else f"{self.data[col][row]:.5f}")
+                self.tree.item(item, values=values)
+                self.tree.move(item, '', i)
+                if int(self.data['cycle'][row]) in self.selected_cycles:
+                    selection.append(item)
+            else:
+                self.tree.detach(item)
+        self.tree.selection_set(selection)
+        self.rendered_selection = set(selection)
+
+        total = len(self.view)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def on_tree_select(self, event=None):
+        selection = set(self.tree.selection())
+        if selection == self.rendered_selection:
+            return  # the selection render() restored itself, not a user change
+        self.rendered_selection = selection
+        # Selected cycles scrolled out of the pool stay selected
+        self.selected_cycles = ((self.selected_cycles - self.visible_cycles)
+                                | {int(self.tree.set(item, 'cycle')) for item in selection})
+        if self.on_select is not None:
+            self.on_select(sorted(self.selected_cycles))
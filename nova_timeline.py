@@ -0,0 +1,188 @@
+import bisect
+import os
+import shutil
+import tempfile
+import weakref
+import numpy as np
+
+
+class FenwickTree:
+    """Prefix sums over a fixed number of slots with O(log n) point updates."""
+
+    def __init__(self, values=()):
+        self.n = len(values)
+        self.tree = [0.0] * (self.n + 1)
+        for i, value in enumerate(values, start=1):
+            self.tree[i] += value
+            parent = i + (i & -i)
+            if parent <= self.n:
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return self.n
+
+    def add(self, index, delta):
+        i = index + 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index):
+        """Sum of slots [0, index)."""
+        total = 0.0
+        i = index
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, target):
+        """Slot containing target: the largest index with prefix_sum(index) <= target.
+
+        Requires non-negative slot values.
+        """
+        pos = 0
+        remaining = target
+        step = 1 << self.n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and self.tree[nxt] <= remaining:
+                pos = nxt
+                remaining -= self.tree[nxt]
+            step >>= 1
+        return pos
+
+
+class MergedTimeline:
+    """Merged time/potential series of many files, stored as memory-mapped arrays on disk.
+
+    Each file is written once, with its own relative time, to two raw float64
+    files; `segments` records (first sample index, sample count) per file. The
+    merged order is a fixed layout of slots (the listbox order) and the time
+    offset of every selected file is a prefix sum over the durations of the
+    selected slots before it, kept in a Fenwick tree. Selecting or deselecting
+    a file is therefore O(log n) and never rewrites any samples. Range queries
+    locate the first file through the tree and bisect each file's time array,
+    so only the pages inside the requested window are read.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = tempfile.mkdtemp(prefix="nova_timeline_", dir=directory)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+        self._time_path = os.path.join(self.directory, "time.f8")
+        self._potential_path = os.path.join(self.directory, "potential.f8")
+        self.reset()
+
+    def reset(self):
+        """Drop all stored files and the layout."""
+        self.segments = {}
+        self.durations = {}
+        self.stored = 0
+        self._time = None
+        self._potential = None
+        for path in (self._time_path, self._potential_path):
+            open(path, "wb").close()
+        self.set_layout([])
+
+    def close(self):
+        self._time = None
+        self._potential = None
+        self._finalizer()
+
+    def add_file(self, name, time, potential):
+        """Store one file's samples (time relative to its own start); no-op if already stored."""
+        if name in self.segments:
+            return
+        time = np.asarray(time, dtype=np.float64)
+        potential = np.asarray(potential, dtype=np.float64)
+        keep = ~np.isnan(time)  # rows without a time stamp cannot be placed on the timeline
+        time, potential = time[keep], potential[keep]
+
+        with open(self._time_path, "ab") as f:
+            time.tofile(f)
+        with open(self._potential_path, "ab") as f:
+            potential.tofile(f)
+        self.segments[name] = (self.stored, len(time))
+        self.durations[name] = float(time[-1]) if len(time) else 0.0
+        self.stored += len(time)
+        self._time = None
+        self._potential = None
+
+    def set_layout(self, names):
+        """Fix the merge order of all known files; clears the selection."""
+        self.layout = list(names)
+        self.slots = {name: i for i, name in enumerate(self.layout)}
+        self.offsets = FenwickTree([0.0] * len(self.layout))
+        self.selected = []  # sorted slot indices
+        self.length = 0
+
+    def select(self, names):
+        """Make names the selection, updating only the slots that changed."""
+        new = {self.slots[name] for name in names if name in self.slots and name in self.segments}
+        old = set(self.selected)
+        for slot in old - new:
+            name = self.layout[slot]
+            self.offsets.add(slot, -self.durations[name])
+            self.length -= self.segments[name][1]
+            del self.selected[bisect.bisect_left(self.selected, slot)]
+        for slot in new - old:
+            name = self.layout[slot]
+            self.offsets.add(slot, self.durations[name])
+            self.length += self.segments[name][1]
+            bisect.insort(self.selected, slot)
+
+    def __len__(self):
+        return self.length
+
+    def _arrays(self):
+        if self._time is None and self.stored:
+            self._time = np.memmap(self._time_path, dtype=np.float64, mode="r", shape=(self.stored,))
+            self._potential = np.memmap(self._potential_path, dtype=np.float64, mode="r", shape=(self.stored,))
+        return self._time, self._potential
+
+    def _windows(self, t0=None, t1=None):
+        """(start, stop, offset) sample windows of the selected files overlapping [t0, t1]."""
+        time, _ = self._arrays()
+        if not self.selected:
+            return []
+        first = 0 if t0 is None else self.offsets.search(t0)
+        # Step back one file: a file ending exactly at t0 still has a sample inside the window
+        k = max(bisect.bisect_left(self.selected, first) - 1, 0)
+        offset = self.offsets.prefix_sum(self.selected[k]) if k < len(self.selected) else 0.0
+        windows = []
+        for slot in self.selected[k:]:
+            if t1 is not None and offset > t1:
+                break
+            name = self.layout[slot]
+            start, count = self.segments[name]
+            rel = time[start:start + count]
+            i0 = 0 if t0 is None else int(np.searchsorted(rel, t0 - offset, side="left"))
+            i1 = count if t1 is None else int(np.searchsorted(rel, t1 - offset, side="right"))
+            if i1 > i0:
+                windows.append((start + i0, start + i1, offset))
+            offset += self.durations[name]
+        return windows
+
+    def query(self, t0=None, t1=None, max_points=None):
+        """(time, potential) copies for [t0, t1], strided down to at most max_points samples."""
+        windows = self._windows(t0, t1)
+        total = sum(stop - start for start, stop, _ in windows)
+        if not total:
+            return np.empty(0), np.empty(0)
+        step = 1
+        if max_points and total > max_points:
+            step = -(-total // max_points)
+        time, potential = self._arrays()
+        times = [time[start:stop:step] + offset for start, stop, offset in windows]
+        potentials = [potential[start:stop:step] for start, stop, _ in windows]
+        return np.concatenate(times), np.concatenate(potentials)
+
+    def write_tsv(self, path, header="Time (s)\tWE(1).Potential (V)", chunk_size=1_000_000):
+        """Write the selected timeline chunk by chunk, so memory use does not grow with its length."""
+        time, potential = self._arrays()
+        with open(path, "w") as f:
+            f.write(header + "\n")
+            for start, stop, offset in self._windows():
+                for i in range(start, stop, chunk_size):
+                    j = min(i + chunk_size, stop)
+                    np.savetxt(f, np.column_stack((time[i:j] + offset, potential[i:j])), fmt="%.6f", delimiter="\t")